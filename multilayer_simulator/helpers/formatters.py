@@ -1,8 +1,19 @@
-from typing import Literal
+from typing import ClassVar, Literal
 
 class DataFormatter:
     """
     Format the output from a given engine in some consistent way.
     """
     OutputFormats = Literal[None, 'xarray_dataset', 'xarray_dataarray'] # allowed formats when passed as a parameter
-    pass
\ No newline at end of file
+    _output_format_methods: ClassVar[dict[str, str]] = {
+        'xarray_dataset': 'to_xarray_dataset',
+        'xarray_dataarray': 'to_xarray_dataarray',
+    } # method names rather than functions, so that subclass overrides are respected
+
+    def to_output_format(self, output_format: OutputFormats = None):
+        """
+        Return the data in the given output format, or None if output_format is None.
+        """
+        if output_format is None:
+            return None
+        return getattr(self, self._output_format_methods[output_format])()
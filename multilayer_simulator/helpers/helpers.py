@@ -1,10 +1,12 @@
 from typing import Iterable, Mapping, Any
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
 
 
 def filter_mapping(mapping: Mapping[Any, Any], filter: Iterable[Any]) -> dict[Any, Any]:
     """
     Return a dictionary with only those key-value pairs from mapping where the key is in filter.
-    Faster if filter is shorter than mapping.
+    filter is converted to a set once, so this is O(len(filter) + len(mapping)). The keys keep their order in mapping.
 
     :param filter: _description_
     :type filter: Iterable[Any]
@@ -13,7 +15,8 @@ def filter_mapping(mapping: Mapping[Any, Any], filter: Iterable[Any]) -> dict[An
     :return: _description_
     :rtype: Dict[Any, Any]
     """
-    filtered_mapping = {k: mapping[k] for k in filter if k in mapping.keys()}
+    wanted = set(filter)
+    filtered_mapping = {k: v for k, v in mapping.items() if k in wanted}
     return filtered_mapping
 
 
@@ -30,6 +33,36 @@ def relabel_mapping(
     :return: Returns the same type as mapping.
     :rtype: Mapping[Any, Any]
     """
+    if type(mapping) is dict:  # fast path for plain dicts
+        return {key_map[key]: value for key, value in mapping.items()}
     relabeled_generator = ((key_map[key], value) for key, value in mapping.items())
     relabeled_mapping = type(mapping)(relabeled_generator)
     return relabeled_mapping
+
+
+def as_float64_array(value: ArrayLike) -> NDArray[np.float64]:
+    """
+    Convert to an at least 1D, C-contiguous float64 array, passing through arrays that already are one.
+
+    :param value: _description_
+    :type value: ArrayLike
+    :return: _description_
+    :rtype: NDArray[np.float64]
+    """
+    return np.ascontiguousarray(np.atleast_1d(value), dtype=np.float64)
+
+
+def absorptance(reflectance: ArrayLike, transmittance: ArrayLike) -> NDArray:
+    """
+    Return 1 - reflectance - transmittance, allocating a single new array.
+
+    :param reflectance: _description_
+    :type reflectance: ArrayLike
+    :param transmittance: _description_
+    :type transmittance: ArrayLike
+    :return: _description_
+    :rtype: NDArray
+    """
+    result = np.subtract(1, reflectance)
+    result -= transmittance  # in-place, so no further temporaries
+    return result
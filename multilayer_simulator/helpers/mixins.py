@@ -4,11 +4,13 @@ import numpy as np
 from numpy.typing import ArrayLike
 from attrs import mutable, field, converters, setters
 
+from multilayer_simulator.helpers.helpers import as_float64_array
+
 
 c = 2.99792458e8
 
-def convert_wavelength_and_frequency(value, c=c):
-    return c/value
+def convert_wavelength_and_frequency(value, c=c, out=None):
+    return np.divide(c, value, out=out)
 
 def set_wavelengths(instance, attrib, new_value):
     instance.wavelengths = convert_wavelength_and_frequency(new_value, instance.c)
@@ -19,10 +21,7 @@ def set_frequencies(instance, attrib, new_value):
     return new_value
 
 def unset_wavelengths(instance, attrib, new_value):
-    try:
-        del instance.wavelengths
-    except: AttributeError
-    
+    instance.__dict__.pop("wavelengths", None)  # clear the cached_property, if it has been computed
     return new_value
 
 @mutable
@@ -45,12 +44,13 @@ class SpectrumMixinV0_2:
     Implements a 'frequencies' and 'wavelengths' interface.
     
     This version gives frequencies primacy and makes wavelengths a derived property with caching.
+    The cache is cleared whenever frequencies is set, so c/frequencies is computed at most once per assignment.
     FIXME: wavelengths is no longer in the repr
     FIXME: can set wavelengths directly but frequencies is not updated
     """
     
     c: float = field(default=c, repr=False, kw_only=True)
-    frequencies: ArrayLike = field(default=None, kw_only=True, converter=converters.optional(np.atleast_1d), on_setattr=[setters.convert, unset_wavelengths])
+    frequencies: ArrayLike = field(default=None, kw_only=True, converter=converters.optional(as_float64_array), on_setattr=[setters.convert, unset_wavelengths])
     # wavelengths: ArrayLike = field(init=False)
     
     @cached_property
@@ -1,7 +1,19 @@
-from typing import Hashable
+from typing import Hashable, Union
 import xarray as xr
 import numpy as np
 
+from multilayer_simulator.helpers.helpers import absorptance
+
+
+def _as_seq(x) -> list:
+    """
+    Treat a list as several keys and anything else as a single key.
+    Tuples count as single keys because they are valid variable names.
+    """
+    if isinstance(x, list):
+        return x
+    return [x]
+
 
 def vector_norm(x, dim, ord=None):
     return xr.apply_ufunc(
@@ -9,40 +21,80 @@ def vector_norm(x, dim, ord=None):
     )
 
 
+def vector_norm_squared(x, dim):
+    """
+    Return the squared 2-norm of x with respect to dim.
+    Contracts x with its complex conjugate directly, which avoids the square root (and re-squaring) implied by vector_norm(x, dim)**2.
+
+    :param x: _description_
+    :type x: xr.DataArray
+    :param dim: _description_
+    :type dim: _type_
+    """
+    return xr.dot(x.conj(), x, dim=dim).real
+
+
 def add_vector_norms_to_xarray_dataset(dataset: xr.Dataset, dim):
     """
-    Modify a dataset in-place by adding the norm of each dataset with respect to dim as a new data variable.
+    Modify a dataset in-place by adding the squared norm of each dataset with respect to dim as a new data variable.
 
     :param dataset: _description_
     :type dataset: xr.Dataset
     :param dim: _description_
     :type dim: _type_
     """
-    for variable in dataset:
-        dataset[f"|{variable}|^2"] = vector_norm(dataset[variable], dim)
+    norms = dataset.map(vector_norm_squared, args=(dim,))
+    dataset.update({f"|{variable}|^2": norms[variable] for variable in norms})
+
 
+def _absorptance(reflectance: xr.DataArray, transmittance: xr.DataArray) -> xr.DataArray:
+    """Return 1 - reflectance - transmittance, working on the raw arrays when no alignment or broadcasting is needed."""
+    if reflectance.dims != transmittance.dims:
+        return 1 - reflectance - transmittance
+    return reflectance.copy(data=absorptance(reflectance.values, transmittance.values))
 
-def add_absorption_to_xarray_dataset(dataset: xr.Dataset, reflectance_key: Hashable, transmittance_key: Hashable, absorptance_key: Hashable):
+
+def add_absorption_to_xarray_dataset(
+    dataset: xr.Dataset,
+    reflectance_key: Union[Hashable, list[Hashable]],
+    transmittance_key: Union[Hashable, list[Hashable]],
+    absorptance_key: Union[Hashable, list[Hashable]],
+):
     """
     Modify a dataset in-place by calculating the absorptance from the DataArrays indicated by the reflectance and transmittance keys, and
     adding it to the dataset under the absorptance key.
+    The keys may also be equal-length lists, in which case each (reflectance, transmittance, absorptance) triple is handled in turn.
+    Raises ValueError if the lists differ in length.
     Fails silently if either the reflectance or transmittance keys are missing.
     TODO: Raise warning instead.
 
     :param dataset: _description_
     :type dataset: xr.Dataset
     :param reflectance_key: _description_
-    :type reflectance_key: Hashable
+    :type reflectance_key: Union[Hashable, list[Hashable]]
     :param transmittance_key: _description_
-    :type transmittance_key: Hashable
+    :type transmittance_key: Union[Hashable, list[Hashable]]
     :param absorptance_key: _description_
-    :type absorptance_key: Hashable
-    """
-    try:
-        reflectance = dataset[reflectance_key]
-        transmittance = dataset[transmittance_key]
-    except KeyError:
-        pass
-    else:
-        dataset[absorptance_key] = 1 - reflectance - transmittance
-    
\ No newline at end of file
+    :type absorptance_key: Union[Hashable, list[Hashable]]
+    """
+    keys = (
+        _as_seq(reflectance_key),
+        _as_seq(transmittance_key),
+        _as_seq(absorptance_key),
+    )
+    if len({len(k) for k in keys}) != 1:
+        raise ValueError(
+            "reflectance_key, transmittance_key and absorptance_key "
+            "must have the same length"
+        )
+
+    absorptances = {}
+    for r, t, a in zip(*keys):
+        try:
+            reflectance = dataset[r]
+            transmittance = dataset[t]
+        except KeyError:
+            pass
+        else:
+            absorptances[a] = _absorptance(reflectance, transmittance)
+    dataset.update(absorptances)
@@ -1,25 +1,101 @@
-from typing import Any, Callable, ClassVar, Hashable, Literal, Mapping, Optional
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Hashable,
+    Literal,
+    Mapping,
+    Optional,
+)
 from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from types import MappingProxyType
 import numpy as np
-from numpy.typing import NDArray
-from attrs import mutable, frozen, field, Factory
-import lumapi
-import xarray as xr
+from numpy.typing import DTypeLike, NDArray
+from attrs import mutable, frozen, field, evolve, Factory
 
 from multilayer_simulator.engine import Engine
 from multilayer_simulator.helpers.formatters import DataFormatter
-from multilayer_simulator.helpers.helpers import filter_mapping, relabel_mapping
-from multilayer_simulator.helpers.xarray import (
-    add_absorption_to_xarray_dataset,
-    add_vector_norms_to_xarray_dataset,
-)
+from multilayer_simulator.helpers.helpers import absorptance
 from multilayer_simulator.structure import Structure
 from multilayer_simulator.material import Material
 
+# lumapi and xarray are heavy, so only import them where they are used
+if TYPE_CHECKING:
+    import lumapi
+    import xarray as xr
+
+
+def _structure_stack(
+    structure: Structure,
+    frequencies: NDArray[np.float_],
+    component: Literal[1, 2, 3] = 1,
+) -> tuple[NDArray[np.float_], NDArray[np.float_]]:
+    """
+    Return structure.optical_stack(frequencies, component), batching the getindex calls into one round-trip
+    when every layer uses LumericalMaterial.index (not an override) of a material in the same session.
+    """
+    layers = getattr(structure, "layers", None)
+    if layers and all(
+        getattr(layer._index, "__func__", None) is LumericalMaterial.index
+        for layer in layers
+    ):
+        materials = [layer._index.__self__ for layer in layers]
+        if len({id(material.session) for material in materials}) == 1:
+            index = LumericalMaterial.batch_index(materials, frequencies, component)
+            return index, structure.thickness
+    return structure.optical_stack(frequencies, component)
+
+
+def _stack_inputs(
+    index: NDArray[np.float_],
+    thickness: NDArray[np.float_],
+    frequencies: NDArray[np.float_],
+    angles: NDArray[np.float_],
+) -> tuple[NDArray, NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Return the stackrt/stackfield inputs as C-contiguous arrays, so lumapi does not make a strided copy of e.g. a transposed index.
+    The index keeps its own (usually complex) dtype; the real-valued inputs are made float64. Arrays that already qualify are passed through without copying.
+    """
+    return (
+        np.ascontiguousarray(index),
+        np.ascontiguousarray(thickness, dtype=np.float64),
+        np.ascontiguousarray(frequencies, dtype=np.float64),
+        np.ascontiguousarray(angles, dtype=np.float64),
+    )
+
+
+def _cast_result(
+    result: dict[str, Any], dtype: Optional[DTypeLike] = None
+) -> dict[str, Any]:
+    """
+    Cast the arrays in a lumapi result to dtype in-place, keeping complex arrays complex at the matching precision.
+    Returns result unchanged if dtype is None.
+    """
+    if dtype is None:
+        return result
+    complex_dtype = np.result_type(dtype, np.complex64)
+    for key, value in result.items():
+        if np.iscomplexobj(value):
+            result[key] = np.asarray(value).astype(complex_dtype, copy=False)
+        elif isinstance(value, np.ndarray) and np.issubdtype(value.dtype, np.floating):
+            result[key] = value.astype(dtype, copy=False)
+    return result
+
 
 @frozen
 class STACKRT(Engine):
     session: lumapi.FDTD
+    _stackrt: Callable = field(
+        default=Factory(lambda self: self.session.stackrt, takes_self=True),
+        init=False,
+        eq=False,
+        repr=False,
+    )  # bound once so repeated calls skip the attribute lookups
 
     def __call__(
         self,
@@ -27,9 +103,11 @@ class STACKRT(Engine):
         thickness: NDArray[np.float_],
         frequencies: NDArray[np.float_],
         angles: NDArray[np.float_],
+        dtype: Optional[DTypeLike] = None,
     ) -> dict[str, Any]:
         """
         Thin wrapper around lumapi.FDTD.stackrt.
+        If dtype is given (e.g. np.float32), the results are cast to it; complex results keep the matching complex precision.
 
         :param index: _description_
         :type index: NDArray[np.float_]
@@ -39,23 +117,23 @@ class STACKRT(Engine):
         :type frequencies: NDArray[np.float_]
         :param angles: _description_
         :type angles: NDArray[np.float_]
+        :param dtype: _description_, defaults to None
+        :type dtype: Optional[DTypeLike], optional
         :return: _description_
         :rtype: dict[str, NDArray[np.float_]]
         """
-        n = index
-        d = thickness
-        f = frequencies
-        theta = angles
+        n, d, f, theta = _stack_inputs(index, thickness, frequencies, angles)
 
-        result = self.session.stackrt(n, d, f, theta)
-        return result
+        result = self._stackrt(n, d, f, theta)
+        return _cast_result(result, dtype)
 
     def simulate(
         self,
         structure: Structure,
         frequencies: NDArray[np.float64],
         angles: NDArray[np.float64],
-        **kwargs
+        dtype: Optional[DTypeLike] = None,
+        **kwargs,
     ):
         """
         Simulate the propagation of light through the structure in one dimension using Lumerical's STACK solver.
@@ -67,19 +145,29 @@ class STACKRT(Engine):
         :type frequencies: NDArray[np.float64]
         :param angles: _description_
         :type angles: NDArray[np.float64]
+        :param dtype: _description_, defaults to None
+        :type dtype: Optional[DTypeLike], optional
         :return: _description_
         :rtype: _type_
         """
-        index = structure.index(frequencies)
-        thickness = structure.thickness
-        data = self(index, thickness, frequencies, angles)
+        index, thickness = _structure_stack(structure, frequencies)
+        data = self(index, thickness, frequencies, angles, dtype=dtype)
         return data
 
 
 @frozen
 class STACKFIELD(Engine):
-    _allowed_kwargs: ClassVar[Iterable[str]] = ["resolution", "min", "max"]
+    _allowed_kwargs: ClassVar[frozenset[str]] = frozenset(["resolution", "min", "max"])
     session: lumapi.FDTD
+    resolution: Optional[int] = field(default=None, kw_only=True)
+    min: Optional[float] = field(default=None, kw_only=True)
+    max: Optional[float] = field(default=None, kw_only=True)
+    _stackfield: Callable = field(
+        default=Factory(lambda self: self.session.stackfield, takes_self=True),
+        init=False,
+        eq=False,
+        repr=False,
+    )  # bound once so repeated calls skip the attribute lookups
 
     def __call__(
         self,
@@ -90,9 +178,12 @@ class STACKFIELD(Engine):
         resolution: Optional[int] = None,
         min: Optional[float] = None,
         max: Optional[float] = None,
+        dtype: Optional[DTypeLike] = None,
     ) -> dict[str, Any]:
         """
         Thin wrapper around lumapi.fdtd.stackfield which handles the optional rel, min, and max arguments.
+        Any of them left as None falls back to the value fixed with configure().
+        If dtype is given (e.g. np.float32), the results are cast to it; complex results keep the matching complex precision.
 
         :param index: _description_
         :type index: NDArray[np.float_]
@@ -108,13 +199,23 @@ class STACKFIELD(Engine):
         :type min: Optional[float], optional
         :param max: _description_, defaults to None
         :type max: Optional[float], optional
+        :param dtype: _description_, defaults to None
+        :type dtype: Optional[DTypeLike], optional
         :return: _description_
         :rtype: dict[str, NDArray[np.float_]]
         """
-        n = index
-        d = thickness
-        f = frequencies
-        theta = angles
+        n, d, f, theta = _stack_inputs(index, thickness, frequencies, angles)
+        args = self._field_args(resolution, min, max)
+
+        result = self._stackfield(n, d, f, theta, *args)
+        return _cast_result(result, dtype)
+
+    @staticmethod
+    def _positional_args(
+        resolution: Optional[int] = None,
+        min: Optional[float] = None,
+        max: Optional[float] = None,
+    ) -> tuple:
         args = []
         if resolution is not None:  # Why this bizarre nested structure?
             args.append(resolution)  # Because stackfield only takes positional args
@@ -124,13 +225,45 @@ class STACKFIELD(Engine):
                 args.append(min)
                 if max is not None:
                     args.append(max)
+        return tuple(args)
 
-        result = self.session.stackfield(n, d, f, theta, *args)
-        return result
+    def _field_args(
+        self,
+        resolution: Optional[int] = None,
+        min: Optional[float] = None,
+        max: Optional[float] = None,
+    ) -> tuple:
+        return self._positional_args(
+            self.resolution if resolution is None else resolution,
+            self.min if min is None else min,
+            self.max if max is None else max,
+        )
+
+    def configure(
+        self,
+        resolution: Optional[int] = None,
+        min: Optional[float] = None,
+        max: Optional[float] = None,
+    ) -> "STACKFIELD":
+        """
+        Return a copy of this engine with the optional stackfield arguments fixed, so they need not be passed on every call in a sweep.
+        Arguments left as None keep their current value, and arguments passed per call still take precedence.
+
+        :param resolution: _description_, defaults to None
+        :type resolution: Optional[int], optional
+        :param min: _description_, defaults to None
+        :type min: Optional[float], optional
+        :param max: _description_, defaults to None
+        :type max: Optional[float], optional
+        :return: _description_
+        :rtype: STACKFIELD
+        """
+        changes = dict(resolution=resolution, min=min, max=max)
+        return evolve(self, **{k: v for k, v in changes.items() if v is not None})
 
     @classmethod
     def filter_kwargs(cls, **kwargs):
-        filtered_kwargs = filter_mapping(kwargs, ["resolution", "min", "max"])
+        filtered_kwargs = {k: v for k, v in kwargs.items() if k in cls._allowed_kwargs}
         return filtered_kwargs
 
     def simulate(
@@ -138,7 +271,8 @@ class STACKFIELD(Engine):
         structure: Structure,
         frequencies: NDArray[np.float64],
         angles: NDArray[np.float64],
-        **kwargs
+        dtype: Optional[DTypeLike] = None,
+        **kwargs,
     ):
         """
         Simulate the propagation of light through the structure in one dimension using Lumerical's STACK solver.
@@ -150,15 +284,17 @@ class STACKFIELD(Engine):
         :type frequencies: NDArray[np.float64]
         :param angles: _description_
         :type angles: NDArray[np.float64]
+        :param dtype: _description_, defaults to None
+        :type dtype: Optional[DTypeLike], optional
         :return: _description_
         :rtype: _type_
         """
-        index = structure.index(frequencies)
-        thickness = structure.thickness
+        index, thickness = _structure_stack(structure, frequencies)
         filtered_kwargs = self.filter_kwargs(**kwargs)
 
-        data = self(index, thickness, frequencies, angles, **filtered_kwargs)
-        return data
+        return self(
+            index, thickness, frequencies, angles, dtype=dtype, **filtered_kwargs
+        )
 
 
 STACKOutput = tuple[dict[str, Any], dict[str, Any]]
@@ -177,51 +313,184 @@ class LumericalSTACK(Engine):
         structure: Structure,
         frequencies: NDArray[np.float_],
         angles: NDArray[np.float_],
-        **kwargs
+        dtype: Optional[DTypeLike] = None,
+        **kwargs,
     ) -> STACKOutput:
         """
         Simulate the propagation of light through the structure in one dimension using Lumerical's STACK solver.
         Returns the output of STACKRT.simulate() and STACKFIELD.simulate() in a tuple.
 
+        When stackrt and stackfield are plain STACKRT and STACKFIELD engines on this session (possibly configured),
+        both solvers run in a single script evaluation. Otherwise each engine is called in turn.
+
         :param structure: _description_
         :type structure: Structure
         :param frequencies: _description_
         :type frequencies: NDArray[np.float_]
         :param angles: _description_
         :type angles: NDArray[np.float_]
+        :param dtype: _description_, defaults to None
+        :type dtype: Optional[DTypeLike], optional
         :return: _description_
         :rtype: _type_
         """
-        index = structure.index(frequencies)
-        thickness = structure.thickness
+        index, thickness = _structure_stack(structure, frequencies)
         filtered_kwargs_for_stackfield = self.stackfield.filter_kwargs(**kwargs)
-        rt_data = self.stackrt(index, thickness, frequencies, angles)
-        field_data = self.stackfield(
-            index, thickness, frequencies, angles, **filtered_kwargs_for_stackfield
-        )
+        if self._can_eval_both():
+            rt_data, field_data = self._eval_both(
+                index, thickness, frequencies, angles, **filtered_kwargs_for_stackfield
+            )
+        else:
+            rt_data = self.stackrt(index, thickness, frequencies, angles)
+            field_data = self.stackfield(
+                index, thickness, frequencies, angles, **filtered_kwargs_for_stackfield
+            )
+        rt_data = _cast_result(rt_data, dtype)
+        field_data = _cast_result(field_data, dtype)
 
         return rt_data, field_data
 
+    def _can_eval_both(self) -> bool:
+        return (
+            type(self.stackrt) is STACKRT
+            and type(self.stackfield) is STACKFIELD
+            and self.stackrt.session is self.session
+            and self.stackfield.session is self.session
+        )
+
+    def _eval_both(
+        self,
+        index: NDArray[np.float_],
+        thickness: NDArray[np.float_],
+        frequencies: NDArray[np.float_],
+        angles: NDArray[np.float_],
+        **stackfield_kwargs,
+    ) -> STACKOutput:
+        """
+        Run stackrt and stackfield in a single script evaluation, so the shared inputs only cross the lumapi boundary once.
+        """
+        n, d, f, theta = _stack_inputs(index, thickness, frequencies, angles)
+        inputs = {
+            "msim_n": n,
+            "msim_d": d,
+            "msim_f": f,
+            "msim_theta": theta,
+        }
+        field_args = self.stackfield._field_args(**stackfield_kwargs)
+        inputs |= {f"msim_field_arg{i}": arg for i, arg in enumerate(field_args)}
+        field_args_script = "".join(
+            f", msim_field_arg{i}" for i in range(len(field_args))
+        )
+        outputs = ("msim_rt", "msim_field")
+        # don't leave a second copy of the (potentially large) field grids in the workspace
+        clear_script = f"clear({', '.join((*inputs, *outputs))});"
+
+        try:
+            for name, value in inputs.items():
+                self.session.putv(name, value)
+            self.session.eval(
+                "msim_rt = stackrt(msim_n, msim_d, msim_f, msim_theta);"
+                "msim_field = stackfield("
+                f"msim_n, msim_d, msim_f, msim_theta{field_args_script});"
+            )
+            results = tuple(self.session.getv(name) for name in outputs)
+        except Exception:
+            # some of the variables may never have been defined, so keep the original error
+            with suppress(Exception):
+                self.session.eval(clear_script)
+            raise
+        self.session.eval(clear_script)
+        return results
+
+    @classmethod
+    def sweep(
+        cls, params_list: Iterable[tuple], n_workers: int, **kwargs
+    ) -> list[STACKOutput]:
+        """
+        Run simulate() for every tuple of positional arguments in params_list, spread over a pool of worker processes that each open their own Lumerical session.
+        Keyword arguments (e.g. resolution, min, max for stackfield) are shared by every call.
+        Results are returned in the same order as params_list.
+
+        Everything in params_list is pickled to reach the workers, so the structures must not be bound to a session (e.g. layers of ConstantIndex rather than LumericalMaterial).
+        Each worker holds a Lumerical licence while it runs, which is why n_workers must be chosen explicitly.
+
+        :param params_list: _description_
+        :type params_list: Iterable[tuple]
+        :param n_workers: _description_
+        :type n_workers: int
+        :return: _description_
+        :rtype: list[STACKOutput]
+        """
+        params_list = list(params_list)
+        if not params_list:
+            return []  # don't open a session (and take a licence) for nothing
+        n_workers = max(1, min(n_workers, len(params_list)))
+        chunks = [params_list[i::n_workers] for i in range(n_workers)]
+
+        results: list[Any] = [None] * len(params_list)
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            chunk_results_iter = executor.map(
+                _sweep_worker, [cls] * n_workers, chunks, [kwargs] * n_workers
+            )
+            for i, chunk_results in enumerate(chunk_results_iter):
+                results[i::n_workers] = chunk_results
+        return results
+
+
+def _sweep_worker(
+    engine_class: type[LumericalSTACK],
+    params_chunk: list[tuple],
+    kwargs: Mapping[str, Any],
+) -> list[STACKOutput]:
+    """
+    Simulate a chunk of engine_class.sweep() on a fresh session owned by this process.
+    """
+    import lumapi
+
+    session = lumapi.FDTD(hide=True)
+    try:
+        engine = engine_class(session)
+        return [engine.simulate(*params, **kwargs) for params in params_chunk]
+    finally:
+        session.close()
+
 
 class LumericalMaterial(Material):
     """
     Represent and control a material in the Lumerical materials database.
     """
 
-    _properties_mapping = {
-        "name": "name",
-        "mesh_order": "mesh order",
-        "color": "color",
-        "anisotropy": "anisotropy",
-        "type": "type",
-    }
+    _properties_mapping: Mapping[str, str] = MappingProxyType(
+        {
+            "name": "name",
+            "mesh_order": "mesh order",
+            "color": "color",
+            "anisotropy": "anisotropy",
+            "type": "type",
+        }
+    )  # keyword argument -> Lumerical property name; read-only so instances can share it
+    _sync_keys: tuple[str, ...] = (
+        "name",
+        "mesh order",
+        "color",
+        "anisotropy",
+        "type",
+    )  # Lumerical properties read back by sync_backwards()
+    # number of (frequencies, component) results memoized by index()
+    _index_cache_size = 8
 
     @classmethod
     def _make_property_struct(
-        cls, key_map: Mapping[str, str] = _properties_mapping, **kwargs
+        cls, key_map: Optional[Mapping[str, str]] = None, **kwargs
     ):
-        # struct = {key_map[key]: value for key, value in kwargs.items()}
-        struct = relabel_mapping(kwargs, key_map)
+        if key_map is None:
+            key_map = cls._properties_mapping
+        unknown = kwargs.keys() - key_map.keys()
+        if unknown:
+            raise TypeError(
+                f"Unknown material properties: {', '.join(sorted(unknown))}"
+            )
+        struct = {key_map[key]: value for key, value in kwargs.items()}
         return struct
 
     def __init__(
@@ -229,8 +498,8 @@ class LumericalMaterial(Material):
         session,
         material_type: Optional[str] = None,
         name: Optional[str] = None,
-        properties_mapping=_properties_mapping,
-        **kwargs
+        properties_mapping: Optional[Mapping[str, str]] = None,
+        **kwargs,
     ):
         """
         A class representing a new material added to the Lumerical materials database for a session.
@@ -241,6 +510,7 @@ class LumericalMaterial(Material):
 
         session: an instance of a Lumerical product session
         material_type: str returned by print(session.addmaterial())
+        properties_mapping: maps keyword arguments to Lumerical property names, if the class defaults are not wanted
 
         Examples
         --------
@@ -251,13 +521,17 @@ class LumericalMaterial(Material):
         """
 
         self.session = session
+        self._index_cache = {}
+        # set_property() has been called since the last sync_backwards()
+        self._dirty = False
         if material_type is not None:
             self._name = session.addmaterial(material_type)
             if name is not None:
                 self.name = name
         elif name is not None:
             self._name = name
-        self._properties_mapping = dict(properties_mapping)
+        if properties_mapping is not None:
+            self._properties_mapping = properties_mapping
         self.set_property(**kwargs)
         self.sync_backwards()
 
@@ -295,22 +569,41 @@ class LumericalMaterial(Material):
         prop: None or str or dict[str, value]
         value: whatever appropriate type the value for prop should be
         """
+        if kwargs:  # raises on unknown keywords before anything is changed
+            struct = self._make_property_struct(self._properties_mapping, **kwargs)
+        if prop or kwargs:
+            self.clear_index_cache()  # any property may change the index
+            self._dirty = True
         if prop and value:
             self.session.setmaterial(self.name, prop, value)
         elif prop:
             self.session.setmaterial(self.name, prop)
         elif kwargs:
-            struct = self._make_property_struct(
-                mapping=self._properties_mapping, **kwargs
-            )
             self.session.setmaterial(self.name, struct)
         else:
             return self.session.setmaterial(self.name).split("\n")
 
         return
 
-    def sync_backwards(self):
-        properties = self.get_property("all")
+    def bulk_set(self, **kwargs):
+        """
+        Set several properties with a single setmaterial call, then update the instance variables with a single sync_backwards().
+        """
+        self.set_property(**kwargs)
+        return self.sync_backwards()
+
+    def sync_backwards(self, only_if_dirty: bool = False):
+        """
+        Update the instance variables from the Lumerical material.
+        Property setters assume that Lumerical stores the value exactly as given, so call this if it might not have.
+
+        If only_if_dirty is True, nothing is fetched (and None is returned) unless a property has been set since the last sync,
+        e.g. to reconcile once after a run of property setters.
+        """
+        if only_if_dirty and not self._dirty:
+            return None
+        properties = self.get_property(list(self._sync_keys))  # one getmaterial call
+        self._dirty = False
         self._name = properties["name"]
         self._mesh_order = properties["mesh order"]
         self._color = properties["color"]
@@ -319,6 +612,7 @@ class LumericalMaterial(Material):
         return properties
 
     def delete(self):
+        self.clear_index_cache()
         self.session.deletematerial(self.name)
 
     def index(
@@ -328,10 +622,101 @@ class LumericalMaterial(Material):
         Return the complex refractive index at frequency f, which may be a float or an array of floats.
 
         For anisotropic materials the component is 1, 2, or 3. (Not currently supported.)
+
+        Results are memoized per (frequencies, component) to save round-trips to the session, and the memo is cleared whenever a property is set.
+        The returned array is read-only because it may be shared between callers.
+        """
+        frequencies = np.asarray(frequencies)
+        key = self._index_key(frequencies, component)
+        try:
+            return self._index_cache[key]
+        except KeyError:
+            pass
+
+        index = np.ascontiguousarray(
+            self.session.getindex(self.name, frequencies, component)
+        ).ravel()  # squeeze from nx1 to n array; a view unless lumapi returned a strided array
+        self._store_index(key, index)
+        return index
+
+    def clear_index_cache(self):
+        """
+        Forget the memoized results of index().
+        Setting properties through this instance does this automatically; call it if the material was changed some other way, e.g. directly through the session.
+        """
+        self._index_cache.clear()
+
+    @staticmethod
+    def _index_key(frequencies: NDArray[np.float_], component: int) -> tuple:
+        return (
+            component,
+            frequencies.dtype.str,
+            frequencies.shape,
+            frequencies.tobytes(),
+        )
+
+    def _store_index(self, key: tuple, index: NDArray[np.float_]):
+        index.flags.writeable = False
+        if len(self._index_cache) >= self._index_cache_size:
+            del self._index_cache[next(iter(self._index_cache))]  # evict the oldest
+        self._index_cache[key] = index
+
+    @classmethod
+    def batch_index(
+        cls,
+        materials: Iterable["LumericalMaterial"],
+        frequencies: NDArray[np.float_],
+        component: Literal[1, 2, 3] = 1,
+    ) -> NDArray[np.float_]:
+        """
+        Return the refractive indices of several materials as an array of shape (len(materials), len(frequencies)).
+
+        All the materials must belong to the same session. Indices not already memoized are fetched with a single script evaluation
+        rather than one getindex call per material, and repeated materials are only fetched once.
+
+        :param materials: _description_
+        :type materials: Iterable[LumericalMaterial]
+        :param frequencies: _description_
+        :type frequencies: NDArray[np.float_]
+        :param component: _description_, defaults to 1
+        :type component: Literal[1, 2, 3], optional
+        :return: _description_
+        :rtype: NDArray[np.float_]
         """
-        return self.session.getindex(self.name, frequencies, component).reshape(
-            -1
-        )  # squeeze from nx1 to n array
+        materials = list(materials)
+        frequencies = np.asarray(frequencies)
+        key = cls._index_key(frequencies, component)
+        missing = list(
+            {
+                id(material): material
+                for material in materials
+                if key not in material._index_cache
+            }.values()
+        )
+
+        if missing:
+            session = missing[0].session
+            session.putv("msim_f", frequencies)
+            session.putv("msim_names", [material.name for material in missing])
+            session.eval(
+                "msim_index = matrix(length(msim_f), length(msim_names));"
+                "for (msim_i = 1:length(msim_names)) {"
+                f"msim_index(:, msim_i) = getindex(msim_names{{msim_i}}, msim_f, {component});"
+                "}"
+            )
+            fetched = np.ascontiguousarray(
+                np.asarray(session.getv("msim_index"))
+                .reshape(frequencies.size, len(missing))
+                .T
+            )  # one contiguous row per material
+            for material, index in zip(missing, fetched):
+                material._store_index(key, index)
+
+        index = np.empty((len(materials), frequencies.size), dtype=np.complex128)
+        # fill in place, no intermediate list
+        for row, material in zip(index, materials):
+            row[...] = material._index_cache[key]
+        return index
 
     @property
     def name(self):
@@ -352,7 +737,7 @@ class LumericalMaterial(Material):
     @mesh_order.setter
     def mesh_order(self, new_mesh_order):
         self.set_property("mesh order", new_mesh_order)
-        self._mesh_order = self.get_property("mesh order")
+        self._mesh_order = new_mesh_order
 
     @property
     def color(self):
@@ -361,7 +746,7 @@ class LumericalMaterial(Material):
     @color.setter
     def color(self, new_color):
         self.set_property("color", new_color)
-        self._color = self.get_property("color")
+        self._color = new_color
 
     @property
     def anisotropy(self):
@@ -370,7 +755,7 @@ class LumericalMaterial(Material):
     @anisotropy.setter
     def anisotropy(self, new_anisotropy):
         self.set_property("anisotropy", new_anisotropy)
-        self._anisotropy = self.get_property("anisotropy")
+        self._anisotropy = new_anisotropy
 
     @property
     def type(self):
@@ -379,7 +764,7 @@ class LumericalMaterial(Material):
     @type.setter
     def type(self, new_type):
         self.set_property("type", new_type)
-        self._type = self.get_property("type")
+        self._type = new_type
 
     def check_properties(self):
         raise NotImplementedError()
@@ -390,36 +775,43 @@ class LumericalOscillator(LumericalMaterial):
     Represent and control a Lorentz Oscillator type material in the Lumerical materials database.
     """
 
-    _properties_mapping = LumericalMaterial._properties_mapping | {
-        "refractive_index": "Refractive Index",
-        "permittivity": "Permittivity",
-        "lorentz_permittivity": "Lorentz Permittivity",
-        "lorentz_resonance": "Lorentz Resonance",
-        "lorentz_linewidth": "Lorentz Linewidth",
-    }
-
-    @classmethod
-    def _make_property_struct(cls, mapping=_properties_mapping, **kwargs):
-        return super()._make_property_struct(mapping, **kwargs)
+    _properties_mapping = MappingProxyType(
+        {
+            **LumericalMaterial._properties_mapping,
+            "refractive_index": "Refractive Index",
+            "permittivity": "Permittivity",
+            "lorentz_permittivity": "Lorentz Permittivity",
+            "lorentz_resonance": "Lorentz Resonance",
+            "lorentz_linewidth": "Lorentz Linewidth",
+        }
+    )
+    _sync_keys = LumericalMaterial._sync_keys + (
+        "Refractive Index",
+        "Permittivity",
+        "Lorentz Permittivity",
+        "Lorentz Resonance",
+        "Lorentz Linewidth",
+    )
 
-    def __init__(
-        self, session, name=None, properties_mapping=_properties_mapping, **kwargs
-    ):
+    def __init__(self, session, name=None, properties_mapping=None, **kwargs):
         super().__init__(
             session=session,
             material_type="Lorentz",
             name=name,
             properties_mapping=properties_mapping,
-            **kwargs
+            **kwargs,
         )
 
-    def sync_backwards(self):
-        properties = super().sync_backwards()
+    def sync_backwards(self, only_if_dirty: bool = False):
+        properties = super().sync_backwards(only_if_dirty)
+        if properties is None:
+            return None
         self._refractive_index = properties["Refractive Index"]
         self._permittivity = properties["Permittivity"]
         self._lorentz_permittivity = properties["Lorentz Permittivity"]
         self._lorentz_resonance = properties["Lorentz Resonance"]
         self._lorentz_linewidth = properties["Lorentz Linewidth"]
+        return properties
 
     @property
     def refractive_index(self):
@@ -429,7 +821,7 @@ class LumericalOscillator(LumericalMaterial):
     @refractive_index.setter
     def refractive_index(self, new_ri):
         self.set_property("Refractive Index", new_ri)
-        self._refractive_index = self.get_property("Refractive Index")
+        self._refractive_index = new_ri
 
     @property
     def permittivity(self):
@@ -438,7 +830,7 @@ class LumericalOscillator(LumericalMaterial):
     @permittivity.setter
     def permittivity(self, new_permittivity):
         self.set_property("Permittivity", new_permittivity)
-        self._permittivity = self.get_property("Permittivity")
+        self._permittivity = new_permittivity
 
     @property
     def lorentz_permittivty(self):
@@ -447,7 +839,7 @@ class LumericalOscillator(LumericalMaterial):
     @lorentz_permittivty.setter
     def lorentz_permittivty(self, new_lorentz_permittivty):
         self.set_property("Lorentz Permittivity", new_lorentz_permittivty)
-        self._lorentz_permittivty = self.get_property("Lorentz Permittivity")
+        self._lorentz_permittivty = new_lorentz_permittivty
 
     @property
     def lorentz_resonance(self):
@@ -456,7 +848,7 @@ class LumericalOscillator(LumericalMaterial):
     @lorentz_resonance.setter
     def lorentz_resonance(self, new_lorentz_resonance):
         self.set_property("Lorentz Resonance", new_lorentz_resonance)
-        self._lorentz_resonance = self.get_property("Lorentz Resonance")
+        self._lorentz_resonance = new_lorentz_resonance
 
     @property
     def lorentz_linewidth(self):
@@ -465,7 +857,7 @@ class LumericalOscillator(LumericalMaterial):
     @lorentz_linewidth.setter
     def lorentz_linewidth(self, new_lorentz_linewidth):
         self.set_property("Lorentz Linewidth", new_lorentz_linewidth)
-        self._lorentz_linewidth = self.get_property("Lorentz Linewidth")
+        self._lorentz_linewidth = new_lorentz_linewidth
 
 
 class LumericalFormatter(DataFormatter):
@@ -476,19 +868,37 @@ class LumericalFormatter(DataFormatter):
         non_dims,
         variables,
         vector: Literal[None, "rectilinear"] = None,
+        relabeling: Optional[Mapping[str, str]] = None,
     ) -> xr.Dataset:
+        """
+        Build an xarray Dataset from a lumapi result.
+        Dimension, coordinate and variable names are relabeled according to relabeling as the Dataset is built,
+        which avoids renaming (and so copying) it afterwards.
+        """
+        import xarray as xr
+
+        if relabeling is None:
+            relabeling = {}
+
+        def label(name):
+            return relabeling.get(name, name)
+
         dim_coords = {
-            dim: lumerical_dataset[dim].reshape(-1) for dim in dims
-        }  # reshape from nx1 array to n array
+            label(dim): np.asarray(lumerical_dataset[dim]).ravel() for dim in dims
+        }  # flatten nx1 array to n array, without copying if already contiguous
+        dims = tuple(label(dim) for dim in dims)
         if vector == "rectilinear":
             dim_coords["vector"] = np.array(["i", "j", "k"])
-            dims = dims + ["vector"]
+            dims = dims + ("vector",)
         non_dim_coords = {
-            non_dim_coord: (dim_coords, lumerical_dataset[non_dim_coord].reshape(-1))
-            for non_dim_coord, dim_coords in non_dims.items()
-        }  # reshape from nx1 array to n array
+            label(non_dim_coord): (
+                label(coord_dims),
+                np.asarray(lumerical_dataset[non_dim_coord]).ravel(),
+            )
+            for non_dim_coord, coord_dims in non_dims.items()
+        }  # flatten nx1 array to n array, without copying if already contiguous
         coords = dim_coords | non_dim_coords
-        data_vars = {var: (dims, lumerical_dataset[var]) for var in variables}
+        data_vars = {label(var): (dims, lumerical_dataset[var]) for var in variables}
 
         dataset = xr.Dataset(data_vars=data_vars, coords=coords)
 
@@ -531,17 +941,26 @@ class format_stackrt(LumericalFormatter):
     add_absorption: bool = True
 
     def to_xarray_dataset(self) -> xr.Dataset:
+        lumerical_dataset = self.lumerical_dataset
+        variables = list(self.variables)
+        # compute on the raw arrays so the Dataset is built once
+        if self.add_absorption:
+            absorptances = {
+                a: absorptance(lumerical_dataset[r], lumerical_dataset[t])
+                for r, t, a in [("Rs", "Ts", "As"), ("Rp", "Tp", "Ap")]
+                if r in variables and t in variables
+            }
+            lumerical_dataset = dict(lumerical_dataset) | absorptances
+            variables += absorptances.keys()
+
         dataset = self.lumerical_to_xarray(
-            lumerical_dataset=self.lumerical_dataset,
+            lumerical_dataset=lumerical_dataset,
             dims=self.dims,
             non_dims=self.non_dims,
-            variables=self.variables,
+            variables=variables,
             vector=None,
+            relabeling=self.relabeling,
         )
-        dataset = dataset.rename(name_dict=self.relabeling)
-        if self.add_absorption:
-            add_absorption_to_xarray_dataset(dataset, "Rs", "Ts", "As")
-            add_absorption_to_xarray_dataset(dataset, "Rp", "Tp", "Ap")
         return dataset
 
 
@@ -561,9 +980,13 @@ class format_stackfield(LumericalFormatter):
             non_dims=self.non_dims,
             variables=self.variables,
             vector="rectilinear",
+            relabeling=self.relabeling,
         )
-        dataset = dataset.rename(name_dict=self.relabeling)
         if self.add_norms:
+            from multilayer_simulator.helpers.xarray import (
+                add_vector_norms_to_xarray_dataset,
+            )
+
             add_vector_norms_to_xarray_dataset(dataset, "vector")
         return dataset
 
@@ -585,10 +1008,7 @@ class format_STACK(DataFormatter):
         return format_stackfield
 
     def __attrs_post_init__(self):  #
-        if self.format == "xarray_dataset":
-            return self.to_xarray_dataset()
-        if self.format == "xarray_dataarray":
-            return self.to_xarray_dataarray()
+        return self.to_output_format(self.format)
 
     @classmethod
     def from_tuple(
@@ -1,5 +1,5 @@
 from typing import Literal, Optional
-from attrs import mutable
+from attrs import frozen
 import numpy as np
 from numpy.typing import NDArray
 
@@ -20,7 +20,7 @@ class Material:
         pass
 
 
-@mutable
+@frozen(cache_hash=True)
 class ConstantIndex(Material):
     _index: float = 1
 
@@ -29,4 +29,8 @@ class ConstantIndex(Material):
         frequencies: Optional[NDArray[np.float_]] = None,
         component: Literal[1, 2, 3] = 1,
     ) -> NDArray[np.float_]:
-        return self._index
+        """
+        Return the constant index broadcast to the shape of frequencies.
+        The result is a read-only view rather than a new array, so copy it before writing to it.
+        """
+        return np.broadcast_to(np.asarray(self._index), np.shape(frequencies))
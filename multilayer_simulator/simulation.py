@@ -1,8 +1,8 @@
-import numpy as np
 from numpy.typing import ArrayLike
 from attrs import mutable, field, setters
 
 from multilayer_simulator.engine import Engine
+from multilayer_simulator.helpers.helpers import as_float64_array
 from multilayer_simulator.helpers.mixins import SpectrumMixinV0_2
 from multilayer_simulator.structure import Structure
 
@@ -24,7 +24,7 @@ class Simulation(SpectrumMixinV0_2):
     structure: Structure = field(default=None)
     engine: Engine = field(default=None)
     angles: ArrayLike = field(
-        factory=lambda: [0], kw_only=True, converter=np.atleast_1d, on_setattr=setters.convert
+        factory=lambda: [0], kw_only=True, converter=as_float64_array, on_setattr=setters.convert
     )
     data = field(init=False)
 
@@ -2,11 +2,20 @@ from abc import ABC, abstractmethod
 from typing import Callable, Literal
 import numpy as np
 from numpy.typing import NDArray
-from attrs import mutable, frozen, field, setters
+from attrs import mutable, frozen, field, setters, cmp_using
 
+from multilayer_simulator.helpers.helpers import as_float64_array
 from multilayer_simulator.material import Material
 
 
+def _index_callback_key(index: Callable) -> tuple:
+    """
+    Identify an index callback by the object it is bound to (if any) and the function, without hashing the object itself,
+    since e.g. mutable attrs materials are unhashable. Only valid while the callback is alive.
+    """
+    return id(getattr(index, "__self__", index)), getattr(index, "__func__", None)
+
+
 class Structure(ABC):
     """
     Interface for a class representing a structure to be optically modeled in 1D.
@@ -23,6 +32,15 @@ class Structure(ABC):
     def thickness(self) -> NDArray[np.float_]:
         pass
 
+    def optical_stack(
+        self, frequencies: NDArray[np.float_], component: Literal[1, 2, 3] = 1
+    ) -> tuple[NDArray[np.float_], NDArray[np.float_]]:
+        """
+        Return (index, thickness) together, for engines that need both.
+        Subclasses may override this to build them in a single pass.
+        """
+        return self.index(frequencies, component), self.thickness
+
 
 @mutable  # Has to be mutable to allow binding of index function without hacks
 class Layer(Structure):
@@ -34,7 +52,9 @@ class Layer(Structure):
         [NDArray[np.float_], Literal[1, 2, 3], NDArray[np.float_]], NDArray[np.float_]
     ]  # TODO: Type this as callback protocol instead
     thickness: NDArray[np.float_] = field(
-        converter=np.atleast_1d, on_setattr=setters.convert
+        converter=as_float64_array,  # no copy when setting contiguous float64 arrays in a sweep
+        on_setattr=setters.convert,
+        eq=cmp_using(eq=np.array_equal),  # plain == on arrays is elementwise
     )
 
     @thickness.default
@@ -65,14 +85,66 @@ class Multilayer(Structure):
     def index(
         self, frequencies: NDArray[np.float_], component: Literal[1, 2, 3] = 1
     ) -> NDArray[np.float_]:
-        index_array = np.array(
-            [layer.index(frequencies, component) for layer in self.layers]
+        evaluated, keys, _ = self._evaluate_layers(frequencies, component)
+        return self._assemble_index(evaluated, keys)
+
+    def optical_stack(
+        self, frequencies: NDArray[np.float_], component: Literal[1, 2, 3] = 1
+    ) -> tuple[NDArray[np.float_], NDArray[np.float_]]:
+        """
+        Return (index, thickness), walking the layers once.
+        """
+        evaluated, keys, thicknesses = self._evaluate_layers(frequencies, component)
+        return self._assemble_index(evaluated, keys), self._assemble_thickness(
+            thicknesses
+        )
+
+    def _evaluate_layers(
+        self, frequencies: NDArray[np.float_], component: Literal[1, 2, 3] = 1
+    ) -> tuple[dict, list, list]:
+        """
+        Walk the layers once, evaluating each distinct layer index a single time.
+        Returns the results by callback key, the key of every layer in order, and the layer thicknesses in order.
+        """
+        evaluated = {}  # layers sharing a material share one evaluation
+        keys = []
+        thicknesses = []
+        for layer in self.layers:
+            key = _index_callback_key(layer._index)
+            if key not in evaluated:
+                evaluated[key] = np.asarray(layer.index(frequencies, component))
+            keys.append(key)
+            thicknesses.append(layer.thickness)
+        return evaluated, keys, thicknesses
+
+    @staticmethod
+    def _assemble_index(evaluated: dict, keys: list) -> NDArray[np.float_]:
+        if not evaluated:
+            return np.array([])
+
+        # write each layer straight into its row rather than stacking temporaries
+        index_array = np.empty(
+            (len(keys),) + np.broadcast_shapes(*(v.shape for v in evaluated.values())),
+            dtype=np.result_type(*evaluated.values()),
         )
+        for i, key in enumerate(keys):  # rows may be 0-d, so assign by position
+            index_array[i] = evaluated[key]
         return index_array
 
     @property
     def thickness(self) -> NDArray[np.float_]:
-        thickness_array = np.array(
-            [layer.thickness for layer in self.layers]
-        ).squeeze()  # squeeze from nx1 to n array
-        return thickness_array
+        return self._assemble_thickness([layer.thickness for layer in self.layers])
+
+    @staticmethod
+    def _assemble_thickness(
+        thicknesses: list[NDArray[np.float_]],
+    ) -> NDArray[np.float_]:
+        try:
+            thickness_array = np.fromiter(
+                (thickness.item() for thickness in thicknesses),
+                dtype=np.float64,
+                count=len(thicknesses),
+            )
+        except ValueError:  # some layer has an array of thicknesses
+            thickness_array = np.array(thicknesses, dtype=np.float64)
+        return thickness_array.squeeze()  # squeeze from nx1 to n array
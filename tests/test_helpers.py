@@ -0,0 +1,16 @@
+import numpy as np
+
+from multilayer_simulator.helpers.helpers import absorptance, filter_mapping
+
+
+def test_filter_mapping_keeps_mapping_order():
+    mapping = {"resolution": 10, "foo": 1, "min": 0.0, "max": 1.0}
+    filtered = filter_mapping(mapping, ["max", "min", "resolution", "bar"])
+    assert list(filtered) == ["resolution", "min", "max"]
+    assert filtered == {"resolution": 10, "min": 0.0, "max": 1.0}
+
+
+def test_absorptance():
+    reflectance = np.array([0.1, 0.5])
+    transmittance = np.array([0.2, 0.5])
+    np.testing.assert_allclose(absorptance(reflectance, transmittance), [0.7, 0.0])
@@ -1,23 +1,37 @@
-import lumapi
+"""
+Check that lumapi (and lumopt) can be imported and that an FDTD session can be opened and run a script.
 
-# If there's an error here, you have probably forgotten to add lumapi to the system path - see the README.
+The session is only opened when the tests actually run, once for the whole test session, and the tests are skipped if lumapi is not on the path.
+"""
 
-print("lumapi imported!")
+import pytest
 
-import lumopt
+# If this skips, you have probably forgotten to add lumapi to the system path - see the README.
+lumapi = pytest.importorskip(
+    "lumapi", reason="lumapi is not on the system path - see the README"
+)
 
-# If there's an error here, for some reason lumopt wasn't added to the path at the same time as lumapi, despite being in a child directory. Beats me.
 
-print("lumopt imported!")
+@pytest.fixture(scope="session")
+def fdtd():
+    # The most likely reason to break here is a licensing issue when initializing Lumerical.
+    session = lumapi.FDTD(hide=True)
+    yield session
+    session.close()
 
-fdtd = lumapi.FDTD()
 
-# The most likely reason to break here is a licensing issue when initializing Lumerical.
+def test_lumopt_import():
+    # If there's an error here, for some reason lumopt wasn't added to the path at the same time as lumapi, despite being in a child directory. Beats me.
+    import lumopt  # noqa: F401
 
-print("FDTD object created!")
 
-# import function defined in script format string
-fdtd .eval("function helloWorld() { return \"hello world\"; }\nfunction returnFloat() { return 1.; }\nfunction addTest(a, b){ return a*b; }")
-print(fdtd .helloWorld())
-
-# It really shouldn't break here
\ No newline at end of file
+def test_lumapi_smoke(fdtd):
+    # import function defined in script format string
+    fdtd.eval(
+        'function helloWorld() { return "hello world"; }\n'
+        "function returnFloat() { return 1.; }\n"
+        "function addTest(a, b){ return a*b; }"
+    )
+    assert fdtd.helloWorld() == "hello world"
+    assert fdtd.returnFloat() == 1.0
+    assert fdtd.addTest(2, 3) == 6
@@ -0,0 +1,274 @@
+"""
+Tests for the Lumerical wrappers that run without Lumerical, using a minimal stand-in for a lumapi session.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from multilayer_simulator import lumerical_classes
+from multilayer_simulator.lumerical_classes import (
+    STACKFIELD,
+    STACKRT,
+    LumericalOscillator,
+    LumericalSTACK,
+)
+from multilayer_simulator.material import ConstantIndex
+from multilayer_simulator.structure import Layer, Multilayer
+
+
+class FakeSession:
+    """
+    Records script calls and keeps a workspace of variables, like a lumapi session.
+    Only understands the scripts that the wrappers under test send.
+    """
+
+    def __init__(self):
+        self.workspace = {}
+        self.scripts = []
+        self.materials = {}
+        self.getindex_calls = 0
+        self.fail_on = None
+
+    def addmaterial(self, material_type):
+        name = f"New Material {len(self.materials)}"
+        self.materials[name] = {
+            "name": name,
+            "mesh order": 2,
+            "color": [1, 0, 0, 1],
+            "anisotropy": 0,
+            "type": material_type,
+            "Refractive Index": 1.0,
+            "Permittivity": 1.0,
+            "Lorentz Permittivity": 1.0,
+            "Lorentz Resonance": 1.0,
+            "Lorentz Linewidth": 1.0,
+        }
+        return name
+
+    def getmaterial(self, name, prop):
+        if isinstance(prop, list):
+            return {key: self.materials[name][key] for key in prop}
+        return self.materials[name][prop]
+
+    def setmaterial(self, name, prop, value=None):
+        if isinstance(prop, dict):
+            self.materials[name].update(prop)
+        elif prop == "name":
+            self.materials[value] = self.materials.pop(name)
+            self.materials[value]["name"] = value
+        else:
+            self.materials[name][prop] = value
+
+    def getindex(self, name, frequencies, component):
+        self.getindex_calls += 1
+        index = self.materials[name]["Refractive Index"]
+        return np.full((np.size(frequencies), 1), index, dtype=complex)
+
+    def stackrt(self, *args):
+        raise AssertionError("LumericalSTACK should run stackrt through eval")
+
+    def stackfield(self, *args):
+        raise AssertionError("LumericalSTACK should run stackfield through eval")
+
+    def putv(self, name, value):
+        self.workspace[name] = value
+
+    def getv(self, name):
+        return self.workspace[name]
+
+    def eval(self, script):
+        self.scripts.append(script)
+        if script == self.fail_on:
+            raise RuntimeError("script failed")
+        if script.startswith("clear("):
+            for name in script[6:-2].split(", "):
+                del self.workspace[name]
+        elif "msim_index" in script:
+            frequencies = self.workspace["msim_f"]
+            self.workspace["msim_index"] = np.hstack(
+                [
+                    self.getindex(name, frequencies, 1)
+                    for name in self.workspace["msim_names"]
+                ]
+            )
+        elif "stackrt" in script:
+            self.stack_inputs = dict(self.workspace)
+            self.workspace["msim_rt"] = {"Rs": np.zeros((3, 1))}
+            self.workspace["msim_field"] = {"Es": np.zeros((1, 1, 5, 3, 1, 3))}
+
+
+@pytest.fixture
+def multilayer():
+    return Multilayer(
+        [Layer.from_material(ConstantIndex(n), 1e-7) for n in (1.0, 1.5, 1.0)]
+    )
+
+
+def test_stack_clears_workspace(multilayer):
+    session = FakeSession()
+    rt_data, field_data = LumericalSTACK(session).simulate(
+        multilayer, np.linspace(1e14, 2e14, 3), np.array([0.0]), resolution=5
+    )
+    assert set(rt_data) == {"Rs"}
+    assert set(field_data) == {"Es"}
+    assert session.workspace == {}
+
+
+def test_sweep_without_params_opens_no_session():
+    assert LumericalSTACK.sweep([], n_workers=2) == []
+
+
+def _fake_sweep_worker(engine_class, params_chunk, kwargs):
+    return [(params, kwargs) for params in params_chunk]
+
+
+def test_sweep_restores_order(monkeypatch):
+    monkeypatch.setattr(lumerical_classes, "_sweep_worker", _fake_sweep_worker)
+    monkeypatch.setattr(lumerical_classes, "ProcessPoolExecutor", ThreadPoolExecutor)
+    params_list = [(i,) for i in range(7)]
+    results = LumericalSTACK.sweep(params_list, n_workers=3, resolution=10)
+    assert results == [(params, {"resolution": 10}) for params in params_list]
+
+
+@pytest.fixture
+def session():
+    return FakeSession()
+
+
+def test_unknown_property_raises(session):
+    material = LumericalOscillator(session, name="a", refractive_index=2.0)
+    frequencies = np.linspace(1e14, 2e14, 3)
+    cached = material.index(frequencies)
+    material.sync_backwards()
+    with pytest.raises(TypeError, match="mesh_ordr"):
+        material.set_property(mesh_ordr=3)
+    assert session.materials["a"]["mesh order"] == 2
+    assert material.index(frequencies) is cached
+    assert material.sync_backwards(only_if_dirty=True) is None  # not marked dirty
+
+
+def test_index_memo_cleared_by_setters(session):
+    material = LumericalOscillator(session, name="a", refractive_index=2.0)
+    frequencies = np.linspace(1e14, 2e14, 3)
+    np.testing.assert_array_equal(material.index(frequencies), [2.0, 2.0, 2.0])
+    material.index(frequencies.copy())
+    assert session.getindex_calls == 1
+
+    material.refractive_index = 3.0
+    np.testing.assert_array_equal(material.index(frequencies), [3.0, 3.0, 3.0])
+    assert session.getindex_calls == 2
+
+
+def test_batched_index_matches_layer_index(session):
+    a = LumericalOscillator(session, name="a", refractive_index=2.0)
+    b = LumericalOscillator(session, name="b", refractive_index=3.0)
+    multilayer = Multilayer([Layer.from_material(m, 1e-7) for m in (a, b, a)])
+    frequencies = np.linspace(1e14, 2e14, 4)
+    rt_data, _ = LumericalSTACK(session).simulate(
+        multilayer, frequencies, np.array([0.0])
+    )
+    assert session.getindex_calls == 2  # one per distinct material, in one script
+    np.testing.assert_array_equal(
+        multilayer.index(frequencies), [[2.0] * 4, [3.0] * 4, [2.0] * 4]
+    )
+    assert session.getindex_calls == 2  # served from the memo
+
+
+class DoubledOscillator(LumericalOscillator):
+    def index(self, frequencies, component=1):
+        return 2 * super().index(frequencies, component)
+
+
+def test_overridden_index_is_not_batched(session):
+    a = LumericalOscillator(session, name="a", refractive_index=2.0)
+    b = DoubledOscillator(session, name="b", refractive_index=3.0)
+    multilayer = Multilayer([Layer.from_material(m, 1e-7) for m in (a, b)])
+    frequencies = np.linspace(1e14, 2e14, 4)
+    LumericalSTACK(session).simulate(multilayer, frequencies, np.array([0.0]))
+    assert not any("msim_index" in script for script in session.scripts)
+    np.testing.assert_array_equal(
+        session.stack_inputs["msim_n"], [[2.0] * 4, [6.0] * 4]
+    )
+
+
+def test_sync_only_if_dirty(session):
+    material = LumericalOscillator(session, name="a", refractive_index=2.0)
+    assert material.sync_backwards(only_if_dirty=True) is None
+
+    material.refractive_index = 3.0
+    session.materials["a"]["Refractive Index"] = 3.5  # as if Lumerical adjusted it
+    assert material.refractive_index == 3.0
+    properties = material.sync_backwards(only_if_dirty=True)
+    assert properties["Refractive Index"] == 3.5
+    assert material.refractive_index == 3.5
+    assert material.sync_backwards(only_if_dirty=True) is None
+
+
+def test_stack_keeps_original_error(multilayer):
+    session = FakeSession()
+    engine = LumericalSTACK(session)
+    session.fail_on = "msim_rt = stackrt(msim_n, msim_d, msim_f, msim_theta);" + (
+        "msim_field = stackfield(msim_n, msim_d, msim_f, msim_theta);"
+    )
+    # the cleanup fails too, because msim_rt and msim_field were never defined
+    with pytest.raises(RuntimeError, match="script failed"):
+        engine.simulate(multilayer, np.linspace(1e14, 2e14, 3), np.array([0.0]))
+
+
+class RecordingSTACKRT(STACKRT):
+    def __call__(self, index, thickness, frequencies, angles, dtype=None):
+        return {"custom": index}
+
+
+def test_stack_uses_custom_engine(multilayer):
+    session = FakeSession()
+    session.stackfield = lambda n, d, f, theta, *args: {"Es": np.zeros(1)}
+    engine = LumericalSTACK(session, stackrt=RecordingSTACKRT(session))
+    rt_data, field_data = engine.simulate(
+        multilayer, np.linspace(1e14, 2e14, 3), np.array([0.0])
+    )
+    assert set(rt_data) == {"custom"}
+    assert set(field_data) == {"Es"}
+    assert session.scripts == []
+
+
+@pytest.fixture
+def field_calls():
+    session = FakeSession()
+    calls = []
+    session.stackfield = lambda n, d, f, theta, *args: calls.append(args) or {}
+    return session, calls
+
+
+def _call_stackfield(engine, **kwargs):
+    engine(
+        np.ones((2, 1)),
+        np.array([0.0, 0.0]),
+        np.array([1e14]),
+        np.array([0.0]),
+        **kwargs,
+    )
+
+
+def test_stackfield_without_configure(field_calls):
+    session, calls = field_calls
+    _call_stackfield(STACKFIELD(session))
+    _call_stackfield(STACKFIELD(session), resolution=100)
+    assert calls == [(), (100,)]
+
+
+def test_stackfield_configure(field_calls):
+    session, calls = field_calls
+    engine = STACKFIELD(session).configure(resolution=100, min=0, max=1e-6)
+    _call_stackfield(engine)
+    assert calls == [(100, 0, 1e-6)]
+
+
+def test_stackfield_configure_partial_override(field_calls):
+    session, calls = field_calls
+    engine = STACKFIELD(session).configure(resolution=100, min=0, max=1e-6)
+    _call_stackfield(engine, resolution=200)
+    _call_stackfield(engine.configure(max=2e-6))
+    assert calls == [(200, 0, 1e-6), (100, 0, 2e-6)]
@@ -0,0 +1,18 @@
+import numpy as np
+
+from multilayer_simulator.helpers.mixins import SpectrumMixinV0_2, c
+
+
+def test_wavelengths_follow_frequencies():
+    spectrum = SpectrumMixinV0_2(frequencies=[1e14, 2e14])
+    np.testing.assert_allclose(spectrum.wavelengths, c / np.array([1e14, 2e14]))
+
+    spectrum.frequencies = [3e14]
+    np.testing.assert_allclose(spectrum.wavelengths, [c / 3e14])
+
+    spectrum.frequencies = [4e14, 5e14]
+    np.testing.assert_allclose(spectrum.wavelengths, c / np.array([4e14, 5e14]))
+
+
+def test_wavelengths_without_frequencies():
+    assert SpectrumMixinV0_2().wavelengths is None
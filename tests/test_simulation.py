@@ -0,0 +1,16 @@
+import numpy as np
+
+from multilayer_simulator.simulation import Simulation
+
+
+def test_angles_are_float64_arrays():
+    simulation = Simulation()
+    np.testing.assert_array_equal(simulation.angles, [0.0])
+    assert simulation.angles.dtype == np.float64
+
+    angles = np.array([0.1, 0.2])
+    simulation.angles = angles
+    assert simulation.angles is angles
+
+    simulation.angles = [1, 2]
+    assert simulation.angles.dtype == np.float64
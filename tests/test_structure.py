@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from multilayer_simulator.material import ConstantIndex
+from multilayer_simulator.structure import Layer, Multilayer
+
+
+@pytest.fixture
+def frequencies():
+    return np.linspace(1e14, 2e14, 3)
+
+
+def test_index_with_scalar_callbacks(frequencies):
+    multilayer = Multilayer(
+        [Layer(lambda f, c: 1.45, 1e-7), Layer(lambda f, c: 2.0, 1e-7)]
+    )
+    np.testing.assert_array_equal(multilayer.index(frequencies), [1.45, 2.0])
+
+
+def test_index_at_scalar_frequency():
+    multilayer = Multilayer(
+        [Layer.from_material(ConstantIndex(n), 1e-7) for n in (1.45, 2.0)]
+    )
+    np.testing.assert_array_equal(multilayer.index(1e14), [1.45, 2.0])
+
+
+def test_index_broadcasts_scalar_layers(frequencies):
+    multilayer = Multilayer(
+        [
+            Layer.from_material(ConstantIndex(1.5), 1e-7),
+            Layer(lambda f, c: 2.0, 1e-7),
+            Layer(lambda f, c: np.full(np.shape(f), 1 + 0.1j), 1e-7),
+        ]
+    )
+    np.testing.assert_array_equal(
+        multilayer.index(frequencies),
+        [[1.5] * 3, [2.0] * 3, [1 + 0.1j] * 3],
+    )
+
+
+def test_shared_material_is_evaluated_once(frequencies):
+    calls = []
+
+    def index(f, c):
+        calls.append(f)
+        return np.full(np.shape(f), 1.5)
+
+    layer = Layer(index, 1e-7)
+    multilayer = Multilayer([layer, Layer(lambda f, c: 2.0, 1e-7), layer])
+    np.testing.assert_array_equal(
+        multilayer.index(frequencies), [[1.5] * 3, [2.0] * 3, [1.5] * 3]
+    )
+    assert len(calls) == 1
+
+
+def test_empty_multilayer(frequencies):
+    assert Multilayer([]).index(frequencies).size == 0
+
+
+def test_optical_stack_matches_index_and_thickness(frequencies):
+    material = ConstantIndex(1.5)
+    multilayer = Multilayer(
+        [
+            Layer.from_material(material, 0),
+            Layer(lambda f, c: 2.0, 1e-7),
+            Layer.from_material(material, 2e-7),
+        ]
+    )
+    index, thickness = multilayer.optical_stack(frequencies)
+    np.testing.assert_array_equal(index, multilayer.index(frequencies))
+    np.testing.assert_array_equal(thickness, [0, 1e-7, 2e-7])
+    np.testing.assert_array_equal(thickness, multilayer.thickness)
+
+
+def test_thickness_is_contiguous_float64():
+    thickness = np.array([1e-7, 2e-7])
+    layer = Layer(lambda f, c: 1.0, thickness)
+    assert layer.thickness is thickness
+
+    layer.thickness = np.arange(4.0)[::2]
+    assert layer.thickness.flags.c_contiguous
+    np.testing.assert_array_equal(layer.thickness, [0.0, 2.0])
+
+    layer.thickness = 3
+    assert layer.thickness.dtype == np.float64
+    assert layer.thickness.shape == (1,)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from multilayer_simulator.helpers.xarray import (
+    add_absorption_to_xarray_dataset,
+    add_vector_norms_to_xarray_dataset,
+    vector_norm,
+)
+
+
+@pytest.fixture
+def rt_dataset():
+    dims = ("frequency", "theta")
+    return xr.Dataset(
+        {
+            "Rs": (dims, np.full((3, 2), 0.1)),
+            "Rp": (dims, np.full((3, 2), 0.2)),
+            "Ts": (dims, np.full((3, 2), 0.3)),
+            "Tp": (dims, np.full((3, 2), 0.4)),
+        }
+    )
+
+
+def test_add_absorption_single_key(rt_dataset):
+    add_absorption_to_xarray_dataset(rt_dataset, "Rs", "Ts", "As")
+    np.testing.assert_allclose(rt_dataset["As"], 0.6)
+    assert rt_dataset["As"].dims == rt_dataset["Rs"].dims
+
+
+def test_add_absorption_multiple_keys(rt_dataset):
+    add_absorption_to_xarray_dataset(
+        rt_dataset, ["Rs", "Rp"], ["Ts", "Tp"], ["As", "Ap"]
+    )
+    np.testing.assert_allclose(rt_dataset["As"], 0.6)
+    np.testing.assert_allclose(rt_dataset["Ap"], 0.4)
+
+
+def test_add_absorption_skips_missing_keys(rt_dataset):
+    add_absorption_to_xarray_dataset(
+        rt_dataset, ["Rs", "Rx"], ["Ts", "Tx"], ["As", "Ax"]
+    )
+    assert "As" in rt_dataset
+    assert "Ax" not in rt_dataset
+
+
+def test_add_absorption_mismatched_keys(rt_dataset):
+    with pytest.raises(ValueError):
+        add_absorption_to_xarray_dataset(rt_dataset, ["Rs", "Rp"], ["Ts", "Tp"], ["As"])
+    assert "As" not in rt_dataset
+
+
+def test_vector_norms_are_squared():
+    rng = np.random.default_rng(0)
+    dims = ("z", "frequency", "dimension")
+    shape = (4, 3, 3)
+    field = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+    dataset = xr.Dataset({"Es": (dims, field)})
+
+    add_vector_norms_to_xarray_dataset(dataset, "dimension")
+
+    expected = vector_norm(dataset["Es"], "dimension") ** 2
+    np.testing.assert_allclose(dataset["|Es|^2"], expected)
+    assert dataset["|Es|^2"].dims == ("z", "frequency")
+    assert not np.iscomplexobj(dataset["|Es|^2"])
+
+
+def test_add_absorption_tuple_keys():
+    dims = ("frequency",)
+    dataset = xr.Dataset(
+        {("R", "s"): (dims, np.full(3, 0.1)), ("T", "s"): (dims, np.full(3, 0.3))}
+    )
+    add_absorption_to_xarray_dataset(dataset, ("R", "s"), ("T", "s"), ("A", "s"))
+    np.testing.assert_allclose(dataset[("A", "s")], 0.6)